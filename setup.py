@@ -6,7 +6,7 @@ setup(
     version="1.1",
     packages=find_packages(),
     author="zackey-heuristics",
-    install_requires=["requests"],
+    install_requires=["requests", "aiohttp", "orjson"],
     description="Output Zen results in JSON format",
     include_package_data=True,
     url='https://github.com/zackey-heuristics/Zen',
@@ -6,207 +6,844 @@ Usage:
     python zen_json_output.py [GITHUB_USERNAME_URL] [--token GITHUB_TOKEN] [--output OUTPUT_JSON_FILE_PATH]
     python zen_json_output.py [GITHUB_REPOSITORY_URL] [--token GITHUB_TOKEN] [--output OUTPUT_JSON_FILE_PATH]
     python zen_json_output.py [GITHUB_ORGANIZATION_NAME] --org [--token GITHUB_TOKEN] [--output OUTPUT_JSON_FILE_PATH]
+    python zen_json_output.py [GITHUB_ORGANIZATION_NAME] --org [--tokens GITHUB_TOKEN,GITHUB_TOKEN,...] [--output OUTPUT_JSON_FILE_PATH]
 """
 import argparse
+import asyncio
+import collections
 import datetime
-import json
+import itertools
 from math import e
+import os
 import pathlib
-import re
 import sys
+import time
+import urllib.parse
 from urllib import response
-from typing import Optional
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Optional, Union
 
-import requests
+import aiohttp
+import orjson
 
 
-def find_contributors_from_repo(username: str, repo: str, authorization_token: Optional[str] = None) -> list[str]:
+# Maximum number of contributor lookups running at the same time
+CONCURRENCY_LIMIT = 10
+# Maximum number of repositories probed at the same time for a single username
+REPO_PROBE_LIMIT = 8
+# Maximum number of organization members processed at the same time
+MEMBER_CONCURRENCY_LIMIT = 10
+# Maximum number of open sockets shared by all requests
+CONNECTION_LIMIT = 20
+# Seconds the resolved DNS entries are cached by the connector
+DNS_CACHE_TTL = 300
+# Number of retries for responses failing with a transient status
+MAX_RETRIES = 3
+# Base delay in seconds of the exponential backoff between retries
+RETRY_BACKOFF_FACTOR = 0.5
+# Statuses retried with exponential backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Maximum number of contributors resolved by a single GraphQL query
+GRAPHQL_BATCH_SIZE = 100
+# Remaining requests below which new requests wait for the rate limit window to reset
+RATE_LIMIT_THRESHOLD = 2
+
+
+class _RateLimiter:
+    """
+    Rate limiter shared by all the requests charged to one rate limit bucket with one token.
+    
+    It follows the X-RateLimit-Remaining and X-RateLimit-Reset headers and holds new requests
+    back until the window resets once the remaining budget is nearly exhausted. Every request
+    sent reserves one unit of the budget so that concurrent tasks do not overshoot it. A
+    Retry-After delay holds back every request until it has elapsed.
+    """
+    
+    def __init__(self) -> None:
+        self.remaining: Optional[int] = None
+        self.reset: float = 0.0
+        self.blocked_until: float = 0.0
+        self.lock = asyncio.Lock()
+    
+    def available(self) -> bool:
+        """
+        Check whether a request can be sent right away.
+        
+        Returns:
+            bool: True if no Retry-After delay is pending and the remaining budget is sufficient or the window has reset
+        """
+        now = time.time()
+        if now < self.blocked_until:
+            return False
+        return self.remaining is None or self.remaining >= RATE_LIMIT_THRESHOLD or now >= self.reset
+    
+    def resumes_at(self) -> float:
+        """
+        Tell when requests can be sent again once the budget is exhausted.
+        
+        Returns:
+            float: Timestamp of the end of the rate limit window or of the Retry-After delay, whichever is later
+        """
+        return max(self.reset, self.blocked_until)
+    
+    async def acquire(self) -> None:
+        """
+        Wait until a request can be sent without exceeding the rate limit.
+        """
+        async with self.lock:
+            while time.time() < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - time.time())
+            if self.remaining is not None and self.remaining < RATE_LIMIT_THRESHOLD:
+                await asyncio.sleep(max(0, self.reset - time.time()))
+                self.remaining = None
+            if self.remaining is not None:
+                self.remaining -= 1
+    
+    def block(self, delay: float) -> None:
+        """
+        Hold back every request for a Retry-After delay.
+        
+        Args:
+            delay (float): Delay in seconds
+        """
+        self.blocked_until = max(self.blocked_until, time.time() + delay)
+    
+    def update(self, headers) -> None:
+        """
+        Update the remaining budget from the headers of a response.
+        
+        Args:
+            headers: Headers of the response
+        """
+        if "X-RateLimit-Remaining" not in headers or "X-RateLimit-Reset" not in headers:
+            return
+        remaining = int(headers["X-RateLimit-Remaining"])
+        reset = int(headers["X-RateLimit-Reset"])
+        if self.remaining is None or reset > self.reset:
+            self.remaining = remaining
+        else:
+            # responses of the same window may arrive out of order, keep the lowest budget
+            self.remaining = min(self.remaining, remaining)
+        self.reset = max(self.reset, reset)
+
+
+# GitHub token, or tuple of GitHub tokens used in turn
+AuthorizationToken = Union[str, tuple[str, ...], None]
+
+# Rate limiters by rate limit bucket and token
+_RATE_LIMITERS: dict[tuple[str, Optional[str]], _RateLimiter] = collections.defaultdict(_RateLimiter)
+# Round-robin position over each set of tokens, next to the rate limiters it is balanced against
+_TOKEN_CYCLES: dict[tuple[Optional[str], ...], Iterator[Optional[str]]] = {}
+
+
+class _Lookups:
+    """
+    Lookups shared by all the tasks of one run.
+    
+    A run creates its own instance and passes it down, so that concurrent or successive runs
+    in the same process do not see each other's results.
+    """
+    
+    def __init__(self) -> None:
+        # In-flight and completed lookups
+        self.emails: dict[tuple[str, str, str], asyncio.Future] = {}
+        self.pwned: dict[str, asyncio.Future] = {}
+        # Number of callers awaiting each unfinished lookup
+        self.waiters: collections.Counter = collections.Counter()
+        # Emails already found by login, whichever repository they were found in
+        self.resolved: dict[str, dict[str, Any]] = {}
+
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+# Latest commit of one contributor on the default branch, aliased as c<index>
+_GRAPHQL_HISTORY_FIELD = "c%d: defaultBranchRef { target { ... on Commit { history(first: 1, author: {id: $c%d}) { nodes { author { email } } } } } }"
+
+# Path of the ETag cache persisted across runs
+ETAG_CACHE_PATH = pathlib.Path.home() / ".cache" / "zen" / "etags.json"
+# Seconds a cached listing is kept without being revalidated
+ETAG_CACHE_MAX_AGE = 7 * 24 * 60 * 60
+# Maximum number of listing pages kept in the ETag cache, the least recently used are dropped
+ETAG_CACHE_MAX_ENTRIES = 1000
+# Cached GitHub API listings by URL, revalidated with If-None-Match
+_ETAGS: dict[str, dict[str, Any]] = {}
+
+
+def _prune_etag_cache() -> None:
+    """
+    Drop the cached listings that are too old, then the least recently used beyond the size bound.
+    """
+    expiry = time.time() - ETAG_CACHE_MAX_AGE
+    entries = sorted(
+        ((url, entry) for url, entry in _ETAGS.items() if entry.get("time", 0) >= expiry),
+        key=lambda item: item[1]["time"],
+        reverse=True,
+    )
+    _ETAGS.clear()
+    _ETAGS.update(entries[:ETAG_CACHE_MAX_ENTRIES])
+
+
+def load_etag_cache(path: pathlib.Path = ETAG_CACHE_PATH) -> None:
+    """
+    Load the ETag cache saved by a previous run.
+    
+    A missing or unreadable cache is ignored.
+    
+    Args:
+        path (pathlib.Path, optional): Path of the cache file
+    """
+    try:
+        with open(path, "rb") as f:
+            _ETAGS.update(orjson.loads(f.read()))
+    except (OSError, ValueError):
+        pass
+    _prune_etag_cache()
+
+
+def save_etag_cache(path: pathlib.Path = ETAG_CACHE_PATH) -> None:
+    """
+    Save the ETag cache for the next runs.
+    
+    The file is only readable by the current user. A cache that cannot be written, e.g. under
+    a read-only home directory, is skipped.
+    
+    Args:
+        path (pathlib.Path, optional): Path of the cache file
+    """
+    _prune_etag_cache()
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        temporary_path = path.with_suffix(".tmp")
+        temporary_path.unlink(missing_ok=True)
+        with os.fdopen(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+            f.write(orjson.dumps(_ETAGS))
+        temporary_path.replace(path)
+    except OSError:
+        pass
+
+
+def _tokens(authorization_token: AuthorizationToken) -> tuple[Optional[str], ...]:
+    """
+    List the tokens requests can be authenticated with.
+    
+    Args:
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        tuple[Optional[str], ...]: Tokens, or (None,) when no token is given
+    """
+    if not authorization_token:
+        return (None,)
+    if isinstance(authorization_token, str):
+        return (authorization_token,)
+    return authorization_token
+
+
+def _choose_token(resource: str, authorization_token: AuthorizationToken) -> Optional[str]:
+    """
+    Pick the next token in round-robin order, skipping the tokens whose rate limit is exhausted.
+    
+    When every token is exhausted, the one that can send requests again first is picked.
+    
+    Args:
+        resource (str): Rate limit bucket the request is charged to
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        Optional[str]: Token to authenticate the request with
+    """
+    tokens = _tokens(authorization_token)
+    cycle = _TOKEN_CYCLES.get(tokens)
+    if cycle is None:
+        cycle = _TOKEN_CYCLES[tokens] = itertools.cycle(tokens)
+    for _ in range(len(tokens)):
+        token = next(cycle)
+        if _RATE_LIMITERS[(resource, token)].available():
+            return token
+    return min(tokens, key=lambda token: _RATE_LIMITERS[(resource, token)].resumes_at())
+
+
+def _rate_limit_resource(url: str) -> str:
+    """
+    Name the rate limit bucket a URL is charged to.
+    
+    GitHub charges GraphQL queries to a separate rate limit from the REST API of the same host.
+    
+    Args:
+        url (str): URL of the request
+    
+    Returns:
+        str: Host of the URL, followed by /graphql for GraphQL queries
+    """
+    split_url = urllib.parse.urlsplit(url)
+    if split_url.path == "/graphql":
+        return split_url.netloc + split_url.path
+    return split_url.netloc
+
+
+async def _rate_limited_request(session: aiohttp.ClientSession, method: str, url: str, headers: Optional[dict[str, str]] = None, authorization_token: AuthorizationToken = None, json: Any = None) -> aiohttp.ClientResponse:
+    """
+    Send a request honoring the rate limit of the host and token.
+    
+    Several tokens are used in turn, each with its own rate limit.
+    Rate limited responses (403/429) are retried after Retry-After or after the rate limit
+    window resets, and transient server errors, dropped connections and timeouts are retried
+    with exponential backoff.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        method (str): HTTP method
+        url (str): URL to fetch
+        headers (dict[str, str], optional): Headers of the request
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        json (Any, optional): Body of the request, sent as JSON
+    
+    Returns:
+        aiohttp.ClientResponse: Response, with its body already read
+    """
+    resource = _rate_limit_resource(url)
+    headers = dict(headers or {})
+    for attempt in range(MAX_RETRIES + 1):
+        token = _choose_token(resource, authorization_token)
+        if token:
+            headers["Authorization"] = f"token {token}"
+        rate_limiter = _RATE_LIMITERS[(resource, token)]
+        await rate_limiter.acquire()
+        try:
+            async with session.request(method, url, headers=headers, json=json) as response:
+                await response.read()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            # covers ServerDisconnectedError, raised when a pooled keep-alive connection was closed
+            if attempt == MAX_RETRIES:
+                raise
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+            continue
+        rate_limiter.update(response.headers)
+        retry_after = response.status in (403, 429) and "Retry-After" in response.headers
+        if retry_after:
+            # every task sharing this token waits for the delay, not only this one
+            rate_limiter.block(int(response.headers["Retry-After"]))
+        
+        if attempt == MAX_RETRIES:
+            break
+        if retry_after:
+            # the next attempt waits for the delay, or uses another token
+            continue
+        elif response.status in (403, 429) and response.headers.get("X-RateLimit-Remaining") == "0":
+            # the next attempt uses another token, or waits for the reset
+            continue
+        elif response.status in RETRY_STATUSES:
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * 2 ** attempt)
+        else:
+            break
+    return response
+
+
+async def _get_json(session: aiohttp.ClientSession, url: str, authorization_token: AuthorizationToken = None, fields: Optional[tuple[str, ...]] = None) -> tuple[Any, Optional[str]]:
+    """
+    Fetch a GitHub API resource as JSON, optionally revalidating cached responses with their ETag.
+    
+    A 304 Not Modified response costs no rate limit and reuses the cached body. Only the
+    listings are cached, reduced to the fields their callers use, so that the cache does not
+    grow with every contributor looked up.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        url (str): URL of the resource
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        fields (tuple[str, ...], optional): Fields kept from the items of a listing, which is then cached in the ETag cache
+    
+    Returns:
+        tuple[Any, Optional[str]]: Decoded body (None on error) and URL of the next page, if any
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    cached = _ETAGS.get(url) if fields is not None else None
+    if cached:
+        headers["If-None-Match"] = cached["etag"]
+    
+    response = await _rate_limited_request(session, "GET", url, headers, authorization_token)
+    if response.status == 304 and cached:
+        cached["time"] = time.time()
+        return cached["body"], cached["next"]
+    if response.status != 200:
+        return None, None
+    
+    body = await response.json(loads=orjson.loads)
+    next_url = response.links.get("next", {}).get("url")
+    if next_url is not None:
+        next_url = str(next_url)
+    if fields is not None and isinstance(body, list):
+        body = [{field: item.get(field) for field in fields} for item in body]
+        if "ETag" in response.headers:
+            _ETAGS[url] = {"etag": response.headers["ETag"], "body": body, "next": next_url, "time": time.time()}
+    return body, next_url
+
+
+async def _get_paginated_json(session: aiohttp.ClientSession, url: str, fields: tuple[str, ...], authorization_token: AuthorizationToken = None) -> list[dict[str, Any]]:
+    """
+    Fetch every page of a GitHub API list resource.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        url (str): URL of the first page
+        fields (tuple[str, ...]): Fields kept from each item
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        list[dict[str, Any]]: Items of all the pages, reduced to the given fields
+    """
+    items = []
+    while url:
+        body, url = await _get_json(session, url, authorization_token, fields)
+        if not isinstance(body, list):
+            break
+        items.extend(body)
+    return items
+
+
+async def _get_contributors(session: aiohttp.ClientSession, username: str, repo: str, authorization_token: AuthorizationToken = None) -> list[dict[str, Any]]:
+    """
+    Fetch the contributors of a repository as returned by the GitHub API.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        username (str): GitHub username
+        repo (str): GitHub repository name
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        list[dict[str, Any]]: Contributors, with their login and node_id
+    """
+    return await _get_paginated_json(session, 'https://api.github.com/repos/%s/%s/contributors?per_page=100' % (username, repo), ("login", "node_id"), authorization_token)
+
+
+async def find_contributors_from_repo(session: aiohttp.ClientSession, username: str, repo: str, authorization_token: AuthorizationToken = None) -> list[str]:
     """
     Find contributors from a repository.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         username (str): GitHub username
         repo (str): GitHub repository name
-        authorization_token (str, optional): GitHub token
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
     
     Returns:
         contributors (list[str]): List of contributors
     """
-    if authorization_token:
-        headers = {"Authorization": f"token {authorization_token}"}
-        response = requests.get('https://api.github.com/repos/%s/%s/contributors?per_page=100' % (username, repo), headers=headers).text
-    else:
-        response = requests.get('https://api.github.com/repos/%s/%s/contributors?per_page=100' % (username, repo)).text
-        
-    contributors = re.findall(r'https://github\.com/(.*?)"', response)
+    response = await _get_contributors(session, username, repo, authorization_token)
+    contributors = [contributor['login'] for contributor in response]
     return contributors
 
 
-def find_repos_from_username(username: str, authorization_token: Optional[str] = None) -> list[str]:
+async def find_repos_from_username(session: aiohttp.ClientSession, username: str, authorization_token: AuthorizationToken = None) -> list[str]:
     """
     Find repositories from a username.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         username (str): GitHub username
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
     
     Returns:
         list[str]: List of repositories
     """
-    if authorization_token:
-        headers = {"Authorization": f"token {authorization_token}"}
-        response = requests.get('https://api.github.com/users/%s/repos?per_page=100&sort=pushed' % username, headers=headers).text
-    else:
-        response = requests.get('https://api.github.com/users/%s/repos?per_page=100&sort=pushed' % username).text
-        
-    repos = re.findall(r'"full_name":"%s/(.*?)",.*?"fork":(.*?),' % username, response)
+    response = await _get_paginated_json(session, 'https://api.github.com/users/%s/repos?per_page=100&sort=pushed' % username, ("name", "fork"), authorization_token)
     non_forked_repos = []
-    for repo in repos:
-        if repo[1] == 'false':
-            non_forked_repos.append(repo[0])
+    for repo in response:
+        if not repo['fork']:
+            non_forked_repos.append(repo['name'])
     return non_forked_repos
 
 
-def find_users_from_organization(organization: str, authorization_token: Optional[str] = None) -> list[str]:
+async def find_users_from_organization(session: aiohttp.ClientSession, organization: str, authorization_token: AuthorizationToken = None) -> list[str]:
     """
     Find users from an organization.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         organization (str): GitHub organization name
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
     
     Returns:
         members (list[str]): List of users
     """
-    if authorization_token:
-        headers = {"Authorization": f"token {authorization_token}"}
-        response = requests.get('https://api.github.com/orgs/%s/members?per_page=100' % organization, headers=headers).text
-    else:
-        response = requests.get('https://api.github.com/orgs/%s/members?per_page=100' % organization).text
-        
-    members = re.findall(r'https://github\.com/(.*?)"', response)
+    response = await _get_paginated_json(session, 'https://api.github.com/orgs/%s/members?per_page=100' % organization, ("login",), authorization_token)
+    members = [member['login'] for member in response]
     return members
 
 
-def find_email_from_contributor(username: str, repo: str, contributor: str, authorization_token: Optional[str] = None) -> dict[str, str]:
+async def _deduplicated(cache: dict, waiters: collections.Counter, key, factory):
+    """
+    Await a lookup shared by every caller asking for the same key.
+    
+    The first caller schedules the lookup and later callers await the same task, whether it is
+    still in flight or already done. Once every caller awaiting an unfinished lookup has been
+    cancelled, the lookup is cancelled too. Failed or cancelled lookups are dropped from the
+    cache so they can be retried.
+    
+    Args:
+        cache (dict): Mapping from keys to lookup tasks
+        waiters (collections.Counter): Number of callers awaiting each unfinished lookup task
+        key: Key identifying the lookup
+        factory: Callable returning the lookup coroutine
+    
+    Returns:
+        Result of the lookup
+    """
+    task = cache.get(key)
+    if task is None:
+        task = cache[key] = asyncio.ensure_future(factory())
+        
+        def forget_failure(task: asyncio.Future) -> None:
+            # a newer lookup may already be cached under the same key
+            if (task.cancelled() or task.exception() is not None) and cache.get(key) is task:
+                del cache[key]
+        
+        task.add_done_callback(forget_failure)
+    # shield the shared task so that cancelling one caller does not cancel it for the others,
+    # and cancel it once no caller is left waiting for it
+    waiters[task] += 1
+    try:
+        return await asyncio.shield(task)
+    finally:
+        waiters[task] -= 1
+        if not waiters[task]:
+            del waiters[task]
+            if not task.done():
+                # drop it now, so that a caller arriving before the task has unwound starts a new lookup
+                if cache.get(key) is task:
+                    del cache[key]
+                task.cancel()
+
+
+async def _is_pwned(session: aiohttp.ClientSession, lookups: _Lookups, email: str) -> bool:
     """
-    Find email from a contributor.
+    Check whether an email has appeared in a breach, once per email.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        lookups (_Lookups): Lookups shared by the run
+        email (str): Email address
+    
+    Returns:
+        bool: True if the email has been pwned
+    """
+    async def lookup() -> bool:
+        response = await _rate_limited_request(session, "GET", 'https://haveibeenpwned.com/api/v2/breachedaccount/' + email)
+        return response.status == 200
+    
+    return await _deduplicated(lookups.pwned, lookups.waiters, email, lookup)
+
+
+async def _fetch_email(session: aiohttp.ClientSession, sem: asyncio.Semaphore, lookups: _Lookups, username: str, repo: str, contributor: str, authorization_token: AuthorizationToken = None) -> dict[str, str]:
+    """
+    Find email from a contributor asynchronously, using the author of their latest commit.
+    
+    Lookups are memoized per (username, repo, contributor) for the whole run, and a contributor
+    whose email was already found in another repository is not looked up again.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        sem (asyncio.Semaphore): Semaphore bounding the concurrent lookups
+        lookups (_Lookups): Lookups shared by the run
         username (str): GitHub username
         repo (str): GitHub repository name
         contributor (str): GitHub contributor name
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
     
     Returns:
         dict[str, str]: Email of the contributor
     """
-    if authorization_token:
-        headers = {"Authorization": f"token {authorization_token}"}
+    if contributor in lookups.resolved:
+        return {contributor: lookups.resolved[contributor]}
     
-    return_results: dict[str, str] = {}
+    async def lookup() -> dict[str, str]:
+        return_results: dict[str, str] = {}
+        
+        async with sem:
+            # another lookup may have found the email while this one was waiting
+            if contributor in lookups.resolved:
+                return {contributor: lookups.resolved[contributor]}
+            
+            email = None
+            commits, _ = await _get_json(session, 'https://api.github.com/repos/%s/%s/commits?author=%s&per_page=1' % (username, repo, contributor), authorization_token)
+            if commits:
+                email = commits[0]['commit']['author']['email']
+            
+            if email:
+                # the first email found for a login wins, later probes reuse it without a breach check
+                if contributor not in lookups.resolved:
+                    pwned = await _is_pwned(session, lookups, email)
+                    lookups.resolved.setdefault(contributor, {'email': email, 'pwned': pwned})
+                return_results[contributor] = lookups.resolved[contributor]
+            else:
+                return_results[contributor] = email
+        
+        return return_results
     
-    if authorization_token:
-        response = requests.get('https://github.com/%s/%s/commits?author=%s' % (username, repo, contributor), headers=headers).text
-    else:
-        response = requests.get('https://github.com/%s/%s/commits?author=%s' % (username, repo, contributor)).text
+    return await _deduplicated(lookups.emails, lookups.waiters, (username, repo, contributor), lookup)
+
+
+async def _fetch_emails_batch(session: aiohttp.ClientSession, sem: asyncio.Semaphore, lookups: _Lookups, username: str, repo: str, contributors: list[dict[str, Any]], authorization_token: AuthorizationToken = None) -> dict[str, str]:
+    """
+    Find emails from a batch of contributors with a single GraphQL query.
     
-    latest_commit = re.search(r'href="/%s/%s/commit/(.*?)"' % (username, repo), response)
-    if latest_commit:
-        latest_commit = latest_commit.group(1)
-    else:
-        latest_commit = 'dummy'
+    The query holds one aliased history lookup per contributor on the default branch. The
+    contributors whose alias fails or comes back null, or the whole batch if the query fails,
+    fall back to one REST lookup per contributor.
     
-    if authorization_token:
-        commit_details = requests.get('https://github.com/%s/%s/commit/%s.patch' % (username, repo, latest_commit), headers=headers).text
-    else:
-        commit_details = requests.get('https://github.com/%s/%s/commit/%s.patch' % (username, repo, latest_commit)).text
-    
-    email = re.search(r'<(.*)>', commit_details)
-    if email:
-        email = email.group(1)
-        return_results[contributor] = {}
-        return_results[contributor]['email'] = email
-        if requests.get('https://haveibeenpwned.com/api/v2/breachedaccount/' + email).status_code == 200:
-            return_results[contributor]['pwned'] = True
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        sem (asyncio.Semaphore): Semaphore bounding the concurrent lookups
+        lookups (_Lookups): Lookups shared by the run
+        username (str): GitHub username
+        repo (str): GitHub repository name
+        contributors (list[dict[str, Any]]): Contributors, with their login and node_id
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        dict[str, str]: Emails of the contributors
+    """
+    return_results = {}
+    pending = []
+    for contributor in contributors:
+        if contributor['login'] in lookups.resolved:
+            return_results[contributor['login']] = lookups.resolved[contributor['login']]
         else:
-            return_results[contributor]['pwned'] = False
-    else:
-        return_results[contributor] = email
+            pending.append(contributor)
+    if not pending:
+        return return_results
     
-    return return_results
+    declarations = ["$owner: String!", "$name: String!"]
+    fields = []
+    variables = {"owner": username, "name": repo}
+    for index, contributor in enumerate(pending):
+        declarations.append("$c%d: ID!" % index)
+        fields.append(_GRAPHQL_HISTORY_FIELD % (index, index))
+        variables["c%d" % index] = contributor['node_id']
+    query = "query(%s) { repository(owner: $owner, name: $name) { %s } }" % (", ".join(declarations), " ".join(fields))
+    
+    async with sem:
+        response = await _rate_limited_request(session, "POST", GRAPHQL_URL, {"Accept": "application/vnd.github+json"}, authorization_token, json={"query": query, "variables": variables})
+    repository = None
+    failed_aliases = set()
+    if response.status == 200:
+        body = await response.json(loads=orjson.loads)
+        repository = (body.get("data") or {}).get("repository")
+        # a failing alias is nulled out and reported in errors, the other aliases still resolve
+        for error in body.get("errors") or []:
+            path = error.get("path") or []
+            if len(path) > 1 and path[0] == "repository":
+                failed_aliases.add(path[1])
+    if repository is None:
+        repository = {}
+        failed_aliases = {"c%d" % index for index in range(len(pending))}
+    
+    emails = {}
+    fallback = []
+    for index, contributor in enumerate(pending):
+        alias = "c%d" % index
+        branch = repository.get(alias)
+        target = branch.get("target") if branch else None
+        if alias in failed_aliases or target is None:
+            fallback.append(contributor['login'])
+            continue
+        email = None
+        commits = (target.get("history") or {}).get("nodes") or []
+        if commits and commits[0].get("author"):
+            email = commits[0]["author"].get("email")
+        emails[contributor['login']] = email
+    
+    # contributors the query could not resolve are looked up through the REST API instead
+    tasks = [_fetch_email(session, sem, lookups, username, repo, login, authorization_token) for login in fallback]
+    for result in await asyncio.gather(*tasks):
+        return_results.update(result)
+    
+    found = [(login, email) for login, email in emails.items() if email and login not in lookups.resolved]
+    pwned = await asyncio.gather(*[_is_pwned(session, lookups, email) for _, email in found])
+    for (login, email), is_pwned in zip(found, pwned):
+        lookups.resolved.setdefault(login, {'email': email, 'pwned': is_pwned})
+    for login, email in emails.items():
+        return_results[login] = lookups.resolved[login] if email else email
+    return {contributor['login']: return_results[contributor['login']] for contributor in contributors}
 
 
-def find_email_from_username(username: str, authorization_token: Optional[str] = None) -> dict[str, str]:
+async def find_email_from_username(session: aiohttp.ClientSession, username: str, authorization_token: AuthorizationToken = None, lookups: Optional[_Lookups] = None) -> dict[str, str]:
     """
-    Find email from a username.
+    Find email from a username, probing the repositories concurrently.
+    
+    The first repository yielding an email wins and the remaining probes are cancelled.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         username (str): GitHub username
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        lookups (_Lookups, optional): Lookups shared by the run, a fresh set when not given
     
     Returns:
         dict[str, str]: Email of the username
     """
-    repos = find_repos_from_username(username, authorization_token)
-    for repo in repos:
-        return_results = find_email_from_contributor(username, repo, username, authorization_token)
-        if return_results:
-            return return_results
+    lookups = lookups or _Lookups()
+    repos = await find_repos_from_username(session, username, authorization_token)
+    sem = asyncio.Semaphore(REPO_PROBE_LIMIT)
+    tasks = [asyncio.create_task(_fetch_email(session, sem, lookups, username, repo, username, authorization_token)) for repo in repos]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            return_results = await next_result
+            if return_results.get(username):
+                return return_results
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
     return {}
 
 
-def find_emails_from_repo(username: str, repo: str, authorization_token: Optional[str] = None) -> dict[str, str]:
+async def find_emails_from_repo(session: aiohttp.ClientSession, username: str, repo: str, authorization_token: AuthorizationToken = None, lookups: Optional[_Lookups] = None) -> dict[str, str]:
     """
-    Find emails from a repository.
+    Find emails from a repository, looking up the contributors concurrently.
+    
+    With a token, contributors are resolved in GraphQL batches of GRAPHQL_BATCH_SIZE; without
+    one (GraphQL requires authentication), each contributor is looked up through the REST API.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         username (str): GitHub username
         repo (str): GitHub repository name
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        lookups (_Lookups, optional): Lookups shared by the run, a fresh set when not given
     
     Returns:
         dict[str, str]: Emails of the contributors
     """
-    contributors = find_contributors_from_repo(username, repo, authorization_token)
+    lookups = lookups or _Lookups()
+    contributors = await _get_contributors(session, username, repo, authorization_token)
+    # a login listed twice across the pages is looked up once
+    contributors = list({contributor['login']: contributor for contributor in contributors}.values())
+    sem = asyncio.Semaphore(CONCURRENCY_LIMIT)
+    if authorization_token:
+        batches = [contributors[begin:begin + GRAPHQL_BATCH_SIZE] for begin in range(0, len(contributors), GRAPHQL_BATCH_SIZE)]
+        tasks = [_fetch_emails_batch(session, sem, lookups, username, repo, batch, authorization_token) for batch in batches]
+    else:
+        tasks = [_fetch_email(session, sem, lookups, username, repo, contributor['login'], authorization_token) for contributor in contributors]
+    results = await asyncio.gather(*tasks)
+    
     return_results = {}
-    for contributor in contributors:
-        return_results.update(find_email_from_contributor(username, repo, contributor, authorization_token))
+    for result in results:
+        return_results.update(result)
     return return_results
 
 
-def find_emails_from_organization_usernames(usernames: list[str], authorization_token: Optional[str] = None) -> dict[str, str]:
+async def _find_email_from_member(session: aiohttp.ClientSession, sem: asyncio.Semaphore, lookups: _Lookups, username: str, authorization_token: AuthorizationToken = None) -> dict[str, str]:
+    """
+    Find email from an organization member, bounded by a semaphore.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        sem (asyncio.Semaphore): Semaphore bounding the concurrent members
+        lookups (_Lookups): Lookups shared by the run
+        username (str): GitHub username
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+    
+    Returns:
+        dict[str, str]: Email of the username
+    """
+    async with sem:
+        return await find_email_from_username(session, username, authorization_token, lookups)
+
+
+async def iter_emails_from_organization_usernames(session: aiohttp.ClientSession, usernames: list[str], authorization_token: AuthorizationToken = None, lookups: Optional[_Lookups] = None) -> AsyncIterator[dict[str, str]]:
+    """
+    Find emails from organization usernames, yielding each member as soon as it is processed.
+    
+    Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
+        usernames (list[str]): List of GitHub usernames
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        lookups (_Lookups, optional): Lookups shared by the run, a fresh set when not given
+    
+    Yields:
+        dict[str, str]: Email of a username
+    """
+    lookups = lookups or _Lookups()
+    sem = asyncio.Semaphore(MEMBER_CONCURRENCY_LIMIT)
+    tasks = [asyncio.create_task(_find_email_from_member(session, sem, lookups, username, authorization_token)) for username in usernames]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def find_emails_from_organization_usernames(session: aiohttp.ClientSession, usernames: list[str], authorization_token: AuthorizationToken = None, lookups: Optional[_Lookups] = None) -> dict[str, str]:
     """
-    Find emails from organization usernames.
+    Find emails from organization usernames, processing the members concurrently.
     
     Args:
+        session (aiohttp.ClientSession): HTTP session used for the requests
         usernames (list[str]): List of GitHub usernames
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        lookups (_Lookups, optional): Lookups shared by the run, a fresh set when not given
     
     Returns:
         dict[str, str]: Emails of the usernames
     """
     return_results = {}
-    for username in usernames:
-        return_results.update(find_email_from_username(username, authorization_token))
+    async for result in iter_emails_from_organization_usernames(session, usernames, authorization_token, lookups):
+        return_results.update(result)
     return return_results
+
+
+class _JsonObjectWriter:
+    """
+    Write a JSON object to a binary file entry by entry, so that results are written as soon as
+    they are found instead of being kept in memory until the end of the run.
+    """
+    
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.empty = True
     
+    def write(self, results: dict[str, str]) -> None:
+        """
+        Write the entries of a result.
+        
+        Args:
+            results (dict[str, str]): Entries to add to the object
+        """
+        for key, value in results.items():
+            self.file.write(b"{\n" if self.empty else b",\n")
+            self.empty = False
+            value = orjson.dumps(value, option=orjson.OPT_INDENT_2).replace(b"\n", b"\n  ")
+            self.file.write(b"  " + orjson.dumps(key) + b": " + value)
+        self.file.flush()
+    
+    def close(self) -> None:
+        """
+        Terminate the JSON object.
+        """
+        self.file.write(b"{}\n" if self.empty else b"\n}\n")
+        self.file.flush()
 
-def main():
-    parser = argparse.ArgumentParser(description="Output Zen results in JSON format.")
-    parser.add_argument("target", help="GITHUB_USERNAME, GITHUB_USERNAME_URL, GITHUB_REPOSITORY_URL, or GITHUB_ORGANIZATION_NAME")
-    parser.add_argument("--output", help="Output JSON file path")
-    parser.add_argument("--token", help="GitHub token")
-    parser.add_argument("--org", help="Organization", action="store_true")
-    args = parser.parse_args()
-    target = args.target
-    output = args.output
-    if args.token:
-        authorization_token = args.token
-    else:
-        authorization_token = None
-    is_target_organization = args.org
+
+def _parse_target(target: str, is_target_organization: bool) -> tuple[str, str, Optional[str]]:
+    """
+    Resolve the kind of target given on the command line.
     
+    Args:
+        target (str): GITHUB_USERNAME, GITHUB_USERNAME_URL, GITHUB_REPOSITORY_URL, or GITHUB_ORGANIZATION_NAME
+        is_target_organization (bool): Whether the target is an organization
+    
+    Returns:
+        tuple[str, str, Optional[str]]: Kind of target ("organization", "user" or "repo"), username and repository name
+    
+    Raises:
+        ValueError: If the target is not a valid target
+    """
     # remove the trailing slash from the target string if it exists
     if target.endswith("/"):
         target = target[:-1]
     
-    target_organization = target_repo = target_user = False
-    
     # check input target type
     if target.count("/") < 4:
         if "/" in target:
@@ -214,36 +851,91 @@ def main():
         else:
             username = target
         if is_target_organization:
-            target_organization = True
-        else:
-            target_user = True
+            return "organization", username, None
+        return "user", username, None
     elif target.count("/") == 4:
         target_repo = target.split("/")
-        username = target_repo[-2]
-        repo = target_repo[-1]
-        target_repo = True
-    else:
-        print("Invalid input target type.", file=sys.stderr)
-        sys.exit(1)
+        return "repo", target_repo[-2], target_repo[-1]
+    raise ValueError("Invalid input target type.")
+
+
+async def _amain(authorization_token: AuthorizationToken, target_type: str, username: str, repo: Optional[str], writer: _JsonObjectWriter) -> None:
+    """
+    Find emails for the target given on the command line.
+    
+    The whole run shares one event loop, one HTTP session with its connection pool, one set of
+    rate limiters and one set of lookups.
     
+    Args:
+        authorization_token (str | tuple[str, ...], optional): GitHub token, or GitHub tokens used in turn
+        target_type (str): Kind of target ("organization", "user" or "repo")
+        username (str): GitHub username or organization name
+        repo (str, optional): GitHub repository name
+        writer (_JsonObjectWriter): Writer receiving the emails as they are found
+    """
     # find emails
-    if target_organization:
-        usernames = find_users_from_organization(username, authorization_token)
-        json_result = find_emails_from_organization_usernames(usernames, authorization_token)
-    elif target_user:
-        json_result = find_email_from_username(username, authorization_token)
-    elif target_repo:
-        json_result = find_emails_from_repo(username, repo, authorization_token)
-    
-    # Output the result
+    connector = aiohttp.TCPConnector(limit=CONNECTION_LIMIT, ttl_dns_cache=DNS_CACHE_TTL)
+    lookups = _Lookups()
+    async with aiohttp.ClientSession(connector=connector) as session:
+        if target_type == "organization":
+            usernames = await find_users_from_organization(session, username, authorization_token)
+            async for result in iter_emails_from_organization_usernames(session, usernames, authorization_token, lookups):
+                writer.write(result)
+        elif target_type == "user":
+            writer.write(await find_email_from_username(session, username, authorization_token, lookups))
+        elif target_type == "repo":
+            writer.write(await find_emails_from_repo(session, username, repo, authorization_token, lookups))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output Zen results in JSON format.")
+    parser.add_argument("target", help="GITHUB_USERNAME, GITHUB_USERNAME_URL, GITHUB_REPOSITORY_URL, or GITHUB_ORGANIZATION_NAME")
+    parser.add_argument("--output", help="Output JSON file path")
+    token_group = parser.add_mutually_exclusive_group()
+    token_group.add_argument("--token", help="GitHub token")
+    token_group.add_argument("--tokens", help="Comma-separated GitHub tokens used in turn to share the rate limit")
+    parser.add_argument("--org", help="Organization", action="store_true")
+    args = parser.parse_args()
+    output = args.output
+    
+    # validate the target before anything is written
+    try:
+        target_type, username, repo = _parse_target(args.target, args.org)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    if args.tokens is not None:
+        authorization_token = tuple(token.strip() for token in args.tokens.split(",") if token.strip())
+        if not authorization_token:
+            parser.error("--tokens requires at least one token")
+    elif args.token:
+        authorization_token = args.token
+    else:
+        authorization_token = None
+    
+    # find emails, revalidating the responses cached by the previous runs,
+    # and output the results as they are found
+    load_etag_cache()
     if output:
-        with open(output, "w") as f:
-            json.dump(json_result, f, indent=4, ensure_ascii=False)
-        print(f"{pathlib.Path(output).resolve()}")
+        # stream into a temporary file so that a failed run leaves the output file untouched
+        output_path = pathlib.Path(output)
+        temporary_path = output_path.with_name(output_path.name + ".tmp")
+        try:
+            with open(temporary_path, "wb") as f:
+                writer = _JsonObjectWriter(f)
+                asyncio.run(_amain(authorization_token, target_type, username, repo, writer))
+                writer.close()
+            temporary_path.replace(output_path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        print(f"{output_path.resolve()}")
     else:
-        print(json.dumps(json_result, indent=4, ensure_ascii=False))
+        # a failed run leaves the object unterminated so that partial results are not read as valid JSON
+        writer = _JsonObjectWriter(sys.stdout.buffer)
+        asyncio.run(_amain(authorization_token, target_type, username, repo, writer))
+        writer.close()
+    save_etag_cache()
 
 
 if __name__ == "__main__":
     main()
-